@@ -0,0 +1,11 @@
+"""Discrete-event simulator for the Devin Security Backlog orchestrator.
+
+Runs the real inline Python steps of devin-security-backlog.yml against
+modeled GitHub and Devin APIs on a virtual clock, so a 5-hour backlog run
+replays in seconds and throughput changes can be compared before they
+reach a real repo. See DESIGN.md, "Backlog Simulator".
+"""
+from .models import Scenario
+from .runner import simulate
+
+__all__ = ["Scenario", "simulate"]
@@ -0,0 +1,56 @@
+"""Simulate one orchestrator run.
+
+    python -m backlog_sim --alerts 722 --alerts-per-batch auto --keep
+"""
+import argparse
+import json
+
+from .models import Scenario
+from .runner import simulate
+
+
+def main():
+    p = argparse.ArgumentParser(prog="backlog_sim", description=__doc__.splitlines()[0])
+    p.add_argument("--name", default="cli")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--alerts", type=int, default=722)
+    p.add_argument("--files", type=int, default=56)
+    p.add_argument("--alerts-per-batch", default="15")
+    p.add_argument("--max-concurrent", type=int, default=5)
+    p.add_argument("--max-batches", type=int, default=0)
+    p.add_argument("--concurrency-limit", type=int, default=5,
+                   help="Devin concurrent session limit (also sets DEVIN_CONCURRENCY_LIMIT)")
+    p.add_argument("--safety-timeout", type=int, default=19800)
+    p.add_argument("--planner", default=None, help="BATCH_PLANNER override (lpt | greedy)")
+    p.add_argument("--state-backend", default=None, help="STATE_BACKEND override (comment | git-ref | sqlite)")
+    p.add_argument("--crash-at", type=float, default=0.0,
+                   help="lose the orchestrator's runner this many seconds in, then restart (0 = never)")
+    p.add_argument("--external-sessions", type=int, default=0)
+    p.add_argument("--org-peers", type=int, default=0,
+                   help="other repositories sharing the account through the org ledger (sets ORG_REPOS)")
+    p.add_argument("--pr-reviews", type=int, default=0,
+                   help="PR security review runs opened in a burst 20 min in, each needing a session")
+    p.add_argument("--no-terminate", action="store_true", help="model pre-Bug #62 zombie sessions")
+    p.add_argument("--keep", action="store_true", help="keep the scratch dir and print the log path")
+    p.add_argument("--events", action="store_true", help="include the event timeline in the output")
+    args = p.parse_args()
+
+    scenario = Scenario(
+        name=args.name, seed=args.seed, alerts=args.alerts, files=args.files,
+        alerts_per_batch=args.alerts_per_batch, max_concurrent=args.max_concurrent,
+        max_batches=args.max_batches, external_sessions=args.external_sessions,
+        concurrency_limit=args.concurrency_limit, safety_timeout=args.safety_timeout,
+        terminate_sessions=not args.no_terminate, crash_at_s=args.crash_at, org_peers=args.org_peers,
+        pr_reviews=args.pr_reviews,
+        env=dict({"DEVIN_CONCURRENCY_LIMIT": args.concurrency_limit},
+                 **({"BATCH_PLANNER": args.planner} if args.planner else {}),
+                 **({"STATE_BACKEND": args.state_backend} if args.state_backend else {})),
+    )
+    metrics = simulate(scenario, keep=args.keep)
+    if not args.events:
+        metrics.pop("events")
+    print(json.dumps(metrics, indent=2))
+
+
+if __name__ == "__main__":
+    main()
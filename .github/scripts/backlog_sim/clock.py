@@ -0,0 +1,42 @@
+"""Virtual clock and event queue for the backlog simulator.
+
+The orchestrator is a single polling loop, so the simulation is driven by its
+own calls: every time.sleep() and every API request advances the clock, and
+any model events that fall due in between (a run starting, a session
+finishing, a zombie slot being reclaimed) are fired in timestamp order before
+control returns to the workflow code.
+"""
+import heapq
+import itertools
+
+# 2026-02-17T00:00:00Z — same day as ST-5/ST-6, so created>= filters and
+# date-stamped log lines look like a real run.
+EPOCH = 1771286400.0
+
+
+class VirtualClock:
+    def __init__(self, start=EPOCH):
+        self.now = float(start)
+        self._events = []
+        self._seq = itertools.count()
+
+    def schedule(self, at, fn, *args):
+        """Run fn(*args) when the clock reaches `at` (absolute seconds)."""
+        heapq.heappush(self._events, (max(at, self.now), next(self._seq), fn, args))
+
+    def after(self, delay, fn, *args):
+        self.schedule(self.now + max(delay, 0.0), fn, *args)
+
+    def advance_to(self, t):
+        """Fire every event due at or before t, then move the clock to t."""
+        while self._events and self._events[0][0] <= t:
+            at, _, fn, args = heapq.heappop(self._events)
+            self.now = max(self.now, at)
+            fn(*args)
+        self.now = max(self.now, t)
+
+    def sleep(self, seconds):
+        self.advance_to(self.now + max(float(seconds), 0.0))
+
+    def pending(self):
+        return len(self._events)
@@ -0,0 +1,88 @@
+"""Scriptable fault injection for the simulated APIs.
+
+A fault plan is a list of rules; each request is checked against them in
+order and the first rule that fires decides what happens:
+
+    [
+      {"match": "POST /v1/sessions", "kind": "status", "status": 503, "p": 0.2},
+      {"match": "GET /repos/.*/code-scanning/alerts", "kind": "html", "nth": [3]},
+      {"match": "GET /repos/.*/actions/.*runs", "kind": "latency", "seconds": 8, "every": 5},
+      {"match": ".", "kind": "status", "status": 429, "retry_after": 60,
+       "window": [1800, 1900]}
+    ]
+
+match   regex searched in "METHOD /path?query"
+kind    "latency" (adds `seconds` before the real answer), "status" (answers
+        `status` with an error body, optional `retry_after`), "html" (answers
+        200 with an HTML page instead of JSON, as GitHub's rate-limit and
+        unicorn pages do) or "truncate" (cuts the real JSON body in half)
+when    `p` (probability, seeded), `nth` (1-based match counts), `every` (every
+        n-th match), `window` ([start, end] seconds since the run started) and
+        `limit` (max times the rule fires); all given conditions must hold
+"""
+import json
+import random
+import re
+from urllib.parse import urlsplit
+
+HTML_PAGE = (b"<!DOCTYPE html><html><head><title>Unicorn! \xc2\xb7 GitHub</title></head>"
+             b"<body><p>No server is currently available to service your request.</p></body></html>")
+
+
+class FaultInjector:
+    def __init__(self, rules, clock, seed=0, sleep=None):
+        self.rules = [dict(r, _rx=re.compile(r.get("match", ".")), _seen=0, _fired=0) for r in rules or []]
+        for r in self.rules:
+            if isinstance(r.get("nth"), int):
+                r["nth"] = [r["nth"]]
+        self.clock = clock
+        self.start = clock.now
+        self.rng = random.Random(seed)
+        self.sleep = sleep or clock.sleep
+        self.fired = []
+
+    def _fires(self, rule):
+        rule["_seen"] += 1
+        if "limit" in rule and rule["_fired"] >= rule["limit"]:
+            return False
+        if "nth" in rule and rule["_seen"] not in rule["nth"]:
+            return False
+        if "every" in rule and rule["_seen"] % rule["every"]:
+            return False
+        if "window" in rule:
+            t = self.clock.now - self.start
+            if not rule["window"][0] <= t < rule["window"][1]:
+                return False
+        if "p" in rule and self.rng.random() >= rule["p"]:
+            return False
+        return True
+
+    def wrap(self, transport):
+        """Return a transport with the same (method, url, headers, body)
+        signature that applies this plan in front of `transport`."""
+        def faulty(method, url, headers=None, body=None):
+            parts = urlsplit(url)
+            key = f"{method.upper()} {parts.path}" + (f"?{parts.query}" if parts.query else "")
+            for rule in self.rules:
+                if not rule["_rx"].search(key) or not self._fires(rule):
+                    continue
+                rule["_fired"] += 1
+                kind = rule.get("kind", "status")
+                self.fired.append({"t": round(self.clock.now - self.start, 1), "rule": rule.get("match"), "kind": kind, "request": key})
+                if kind == "latency":
+                    self.sleep(float(rule.get("seconds", 5)))
+                    break
+                if kind == "status":
+                    status = int(rule.get("status", 500))
+                    hdrs = {"Content-Type": "application/json"}
+                    if rule.get("retry_after") is not None:
+                        hdrs["Retry-After"] = str(rule["retry_after"])
+                    return status, hdrs, json.dumps({"message": rule.get("message", f"Injected HTTP {status}")}).encode()
+                if kind == "html":
+                    return int(rule.get("status", 200)), {"Content-Type": "text/html; charset=utf-8"}, HTML_PAGE
+                if kind == "truncate":
+                    status, hdrs, data = transport(method, url, headers, body)
+                    return status, hdrs, data[: len(data) // 2]
+            return transport(method, url, headers, body)
+
+        return faulty
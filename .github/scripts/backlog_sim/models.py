@@ -0,0 +1,684 @@
+"""Modeled GitHub and Devin APIs for the backlog simulator.
+
+Both models answer plain (method, url, headers, body) requests with
+(status, headers, body) tuples, so the same objects back the in-process
+transport used by the simulator and, later, real HTTP stand-in servers.
+
+Only the behaviour the orchestrator depends on is modeled:
+
+GitHub
+  - code-scanning alert listing (Link pagination, ETag / 304) and single GETs
+  - issue comments (list / create / get / patch / delete, ETag on single GET),
+    all authored by the GH_PAT identity (GET /user)
+  - batch workflow dispatch (input validation like the real 422), run listing
+    (created>= filter, per_page/page, display_title from run-name), single
+    run GET, per-run and repo-wide artifact listings and artifact zip download
+  - what a real child run touches: the tracking issue and labels, branches
+    (pushed by a finished Devin session), compare, pulls and PR labels
+  - git refs and the contents API (alert-payload manifests) and git blobs
+    (per-batch alert bundles); trees, commits and non-branch refs with the
+    fast-forward check on ref updates (the git-ref state store)
+  - the child batch run itself: queue delay, setup, polling its Devin session,
+    session termination (or not), verification/PR time and a result artifact
+  - PR security review runs (devin-security-review.yml): their run listing,
+    a 404 unless the scenario has PR reviews
+Devin
+  - POST /v1/sessions with the 30,000-char prompt limit, the concurrent
+    session cap (finished-but-not-terminated sessions still hold a slot,
+    Bug #62) and the creation-rate cooldown seen in ST-5
+  - GET / DELETE /v1/sessions/{id}; a finished session pushes the branch named
+    in its prompt, touching the files of the alerts it lists
+  - POST /v1/attachments (multipart upload, answers with the file's URL)
+"""
+import hashlib
+import io
+import json
+import math
+import re
+import time
+import zipfile
+from dataclasses import dataclass, field
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit, urlunsplit
+
+REPO = "octo-org/backlog-sim"
+RESULT_MARKER = "<!-- devin-batch-result:v1 "   # devin-security-batch.yml "Collect results"
+BATCH_WORKFLOW = "devin-security-batch.yml"
+REVIEW_WORKFLOW = "devin-security-review.yml"
+TOKEN_LOGIN = "devin-automation"   # the GH_PAT identity (GET /user)
+
+RULES = [
+    ("py/sql-injection", "high"),
+    ("py/command-line-injection", "critical"),
+    ("py/path-injection", "high"),
+    ("py/reflective-xss", "medium"),
+    ("py/unsafe-deserialization", "critical"),
+    ("py/full-ssrf", "high"),
+    ("py/clear-text-logging-sensitive-data", "medium"),
+    ("py/weak-cryptographic-algorithm", "low"),
+    ("py/flask-debug", "medium"),
+    ("py/url-redirection", "medium"),
+]
+
+
+@dataclass
+class Scenario:
+    """Everything a simulated orchestrator run depends on."""
+    name: str = "default"
+    seed: int = 1
+    # Backlog and workflow inputs
+    alerts: int = 722
+    files: int = 56
+    alerts_per_batch: str = "15"
+    max_concurrent: int = 5
+    max_batches: int = 0
+    poll_interval: int = 60
+    max_child_runtime: int = 3600
+    safety_timeout: int = 19800
+    env: dict = field(default_factory=dict)          # extra job env (e.g. BATCH_PLANNER)
+    cursor: dict = field(default_factory=dict)        # initial cursor contents (v1 lists)
+    # Lose the orchestrator's runner this many seconds in (0 = never), then
+    # start a new workflow run on the same world after restart_delay_s
+    crash_at_s: float = 0.0
+    restart_delay_s: float = 300.0
+    # GitHub / Actions timing
+    github_latency_s: float = 0.15
+    dispatch_lag_s: float = 3.0
+    queue_delay_s: float = 25.0
+    child_setup_s: float = 60.0
+    child_poll_s: int = 60
+    child_poll_deadline_s: int = 2700
+    child_poll_budget: int = 90
+    post_session_s: float = 90.0
+    child_failure_rate: float = 0.0
+    p_unfixable: float = 0.3
+    p_fixed: float = 0.0
+    # Children post their result as a marker comment on the tracking issue
+    # (besides the artifact); off = artifact-only, as before the result channel.
+    result_comments: bool = True
+    # Devin API
+    devin_latency_s: float = 0.4
+    concurrency_limit: int = 5
+    external_sessions: int = 0
+    # Other repositories' orchestrators sharing the account through the org
+    # ledger (ORG_REPOS): each runs peer_batches sessions, at most
+    # peer_concurrent at a time, with a severity-weighted backlog of
+    # peer_weight (this repository's 722 alerts weigh ~2,000).
+    org_peers: int = 0
+    peer_batches: int = 6
+    peer_concurrent: int = 5
+    peer_weight: int = 600
+    peer_start_s: float = 0.0
+    # PR-triggered security reviews (REVIEW_WORKFLOW) on the same account:
+    # pr_reviews runs start evenly over pr_burst_s from pr_burst_at_s; each
+    # tries to create one session of pr_session_s after pr_setup_s, retrying
+    # 429s after 60/120/240s (EC-7) before failing. With none, the review
+    # workflow does not exist (its run listing is a 404).
+    pr_reviews: int = 0
+    pr_burst_at_s: float = 1200.0
+    pr_burst_s: float = 600.0
+    pr_setup_s: float = 120.0
+    pr_session_s: float = 600.0
+    rate_threshold: int = 10
+    rate_window_s: float = 3600.0
+    rate_cooldown_s: float = 1320.0
+    send_retry_after: bool = False
+    prompt_limit: int = 30000
+    session_mean_s: float = 900.0
+    session_sd_s: float = 180.0
+    session_min_s: float = 300.0
+    session_per_alert_s: float = 0.0
+    terminate_sessions: bool = True
+    zombie_min_s: float = 420.0
+    zombie_max_s: float = 2880.0
+    # Fault plan applied in front of both APIs (see faults.py)
+    faults: list = field(default_factory=list)
+    # Measured wall time of the real run this scenario reproduces (seconds)
+    observed_wall_s: float = 0.0
+
+
+def iso(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def parse_iso(s):
+    import calendar
+    return calendar.timegm(time.strptime(s[:19], "%Y-%m-%dT%H:%M:%S"))
+
+
+def etag_of(payload):
+    return '"' + hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:20] + '"'
+
+
+def with_query(url, **params):
+    parts = urlsplit(url)
+    q = {k: v[-1] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+    q.update({k: str(v) for k, v in params.items()})
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(q, safe=">=:"), ""))
+
+
+class Router:
+    """Regex route table: handlers take (match, query, headers, body)."""
+
+    def __init__(self):
+        self.routes = []
+
+    def add(self, method, pattern, fn, name):
+        self.routes.append((method, re.compile(pattern + r"$"), fn, name))
+
+    def dispatch(self, method, path, query, headers, body):
+        for m, rx, fn, name in self.routes:
+            match = rx.match(path)
+            if match and m == method:
+                return name, fn(match, query, headers, body)
+        return f"{method} <unrouted>", (404, {}, {"message": "Not Found"})
+
+
+class GitHubModel:
+    def __init__(self, world, batch_inputs):
+        self.world = world
+        self.batch_inputs = set(batch_inputs)
+        self.alerts = {}
+        self.comments = {}            # id -> {"id", "issue", "body", "updated_at", "user"}
+        self.issues = {1: {"number": 1, "title": "Devin Security Backlog — Progress Tracker",
+                           "labels": ["devin:backlog-tracker"]}}
+        self.runs = {}                # id -> run dict
+        self.review_runs = {}         # id -> run dict of the PR review workflow
+        self.artifacts = {}           # id -> artifact dict (with "_zip")
+        self.labels = {"devin:backlog-tracker"}
+        self.branches = {}            # name -> files modified vs main
+        self.pulls = {}               # number -> pull dict
+        self.contents = {}            # (branch, path) -> {"sha", "content"}
+        self.blobs = {}               # sha -> base64 content
+        self.objects = {}             # sha -> git tree or commit dict
+        self.refs = {}                # non-branch ref ("devin/backlog-state") -> commit sha
+        self._ids = iter(range(10_000_000, 99_999_999))
+        self.router = r = Router()
+        # Any owner/repo slug: the HTTP stand-in serves whatever repository
+        # the client's GITHUB_REPOSITORY names.
+        base = r"/repos/[^/]+/[^/]+"
+        r.add("GET", r"/user", self.get_user, "GET user")
+        r.add("GET", base + r"/code-scanning/alerts", self.list_alerts, "GET alerts")
+        r.add("GET", base + r"/code-scanning/alerts/(\d+)", self.get_alert, "GET alert")
+        r.add("GET", base + r"/issues/(\d+)/comments", self.list_comments, "GET comments")
+        r.add("POST", base + r"/issues/(\d+)/comments", self.create_comment, "POST comment")
+        r.add("GET", base + r"/issues/comments/(\d+)", self.get_comment, "GET comment")
+        r.add("PATCH", base + r"/issues/comments/(\d+)", self.patch_comment, "PATCH comment")
+        r.add("DELETE", base + r"/issues/comments/(\d+)", self.delete_comment, "DELETE comment")
+        r.add("POST", base + rf"/actions/workflows/{re.escape(BATCH_WORKFLOW)}/dispatches", self.dispatch, "POST dispatch")
+        r.add("GET", base + rf"/actions/workflows/{re.escape(BATCH_WORKFLOW)}/runs", self.list_runs, "GET runs")
+        r.add("GET", base + rf"/actions/workflows/{re.escape(REVIEW_WORKFLOW)}/runs", self.list_review_runs, "GET review runs")
+        r.add("GET", base + r"/actions/runs/(\d+)", self.get_run, "GET run")
+        r.add("GET", base + r"/actions/runs/(\d+)/artifacts", self.run_artifacts, "GET run artifacts")
+        r.add("GET", base + r"/actions/artifacts", self.list_artifacts, "GET artifacts")
+        r.add("GET", base + r"/actions/artifacts/(\d+)/zip", self.download_artifact, "GET artifact zip")
+        r.add("GET", base + r"/issues", self.list_issues, "GET issues")
+        r.add("POST", base + r"/issues", self.create_issue, "POST issue")
+        r.add("GET", base + r"/labels/([^/]+)", self.get_label, "GET label")
+        r.add("POST", base + r"/labels", self.create_label, "POST label")
+        r.add("POST", base + r"/issues/(\d+)/labels", self.add_labels, "POST issue labels")
+        r.add("GET", base + r"/branches/(.+)", self.get_branch, "GET branch")
+        r.add("GET", base + r"/compare/([^.]+)\.\.\.(.+)", self.compare, "GET compare")
+        r.add("GET", base + r"/pulls", self.list_pulls, "GET pulls")
+        r.add("POST", base + r"/pulls", self.create_pull, "POST pull")
+        r.add("GET", base + r"/pulls/(\d+)", self.get_pull, "GET pull")
+        r.add("PATCH", base + r"/pulls/(\d+)", self.patch_pull, "PATCH pull")
+        r.add("GET", base + r"/git/ref/heads/(.+)", self.get_ref, "GET ref")
+        r.add("GET", base + r"/git/ref/(.+)", self.get_other_ref, "GET ref")
+        r.add("POST", base + r"/git/refs", self.create_ref, "POST ref")
+        r.add("PATCH", base + r"/git/refs/(.+)", self.update_ref, "PATCH ref")
+        r.add("POST", base + r"/git/trees", self.create_tree, "POST tree")
+        r.add("GET", base + r"/git/trees/([0-9a-f]+)", self.get_object, "GET tree")
+        r.add("POST", base + r"/git/commits", self.create_commit, "POST commit")
+        r.add("GET", base + r"/git/commits/([0-9a-f]+)", self.get_object, "GET commit")
+        r.add("POST", base + r"/git/blobs", self.create_blob, "POST blob")
+        r.add("GET", base + r"/git/blobs/([0-9a-f]+)", self.get_blob, "GET blob")
+        r.add("GET", base + r"/contents/(.+)", self.get_contents, "GET contents")
+        r.add("PUT", base + r"/contents/(.+)", self.put_contents, "PUT contents")
+
+    def get_user(self, m, q, h, body):
+        return 200, {}, {"login": TOKEN_LOGIN, "type": "User"}
+
+    # ---- alerts ---------------------------------------------------------
+    def seed_alerts(self, n, paths, rng):
+        for number in range(1, n + 1):
+            path = paths[(number - 1) % len(paths)] if number <= len(paths) else rng.choice(paths)
+            rule, sev = rng.choice(RULES)
+            line = rng.randint(5, 200)
+            self.alerts[number] = {
+                "number": number,
+                "state": "open",
+                "rule": {"id": rule, "security_severity_level": sev, "description": rule.split("/")[-1]},
+                "most_recent_instance": {
+                    "ref": "refs/heads/main",
+                    "location": {"path": path, "start_line": line, "end_line": line},
+                    "message": {"text": f"Simulated {rule} finding"},
+                },
+                "html_url": f"https://github.com/{REPO}/security/code-scanning/{number}",
+            }
+
+    def list_alerts(self, m, q, h, body):
+        state = q.get("state", "open")
+        per_page = int(q.get("per_page", 30))
+        page = int(q.get("page", 1))
+        matching = [a for _, a in sorted(self.alerts.items()) if a["state"] == state]
+        chunk = matching[(page - 1) * per_page: page * per_page]
+        headers = {"ETag": etag_of(chunk)}
+        if (page * per_page) < len(matching):
+            headers["Link"] = f'<{with_query(self.world.current_url, page=page + 1)}>; rel="next"'
+        if h.get("if-none-match") == headers["ETag"]:
+            return 304, headers, None
+        return 200, headers, chunk
+
+    def get_alert(self, m, q, h, body):
+        alert = self.alerts.get(int(m.group(1)))
+        return (200, {}, alert) if alert else (404, {}, {"message": "Not Found"})
+
+    # ---- issue comments ---------------------------------------------------
+    def list_comments(self, m, q, h, body):
+        issue = int(m.group(1))
+        since = q.get("since", "")
+        items = [c for c in self.comments.values() if c["issue"] == issue and c["updated_at"] >= since]
+        per_page, page = int(q.get("per_page", 30)), int(q.get("page", 1))
+        return 200, {}, [{"id": c["id"], "body": c["body"], "updated_at": c["updated_at"], "user": {"login": c["user"]}}
+                         for c in items][(page - 1) * per_page: page * per_page]
+
+    def create_comment(self, m, q, h, body):
+        cid = next(self._ids)
+        # Every client in the simulation authenticates with the one GH_PAT
+        self.comments[cid] = {"id": cid, "issue": int(m.group(1)), "body": json.loads(body)["body"],
+                              "updated_at": iso(self.world.clock.now), "user": TOKEN_LOGIN}
+        return 201, {}, {"id": cid, "body": self.comments[cid]["body"]}
+
+    def get_comment(self, m, q, h, body):
+        c = self.comments.get(int(m.group(1)))
+        if not c:
+            return 404, {}, {"message": "Not Found"}
+        payload = {"id": c["id"], "body": c["body"]}
+        tag = etag_of(payload)
+        if h.get("if-none-match") == tag:
+            return 304, {"ETag": tag}, None
+        return 200, {"ETag": tag}, payload
+
+    def patch_comment(self, m, q, h, body):
+        c = self.comments.get(int(m.group(1)))
+        if not c:
+            return 404, {}, {"message": "Not Found"}
+        c["body"] = json.loads(body)["body"]
+        c["updated_at"] = iso(self.world.clock.now)
+        payload = {"id": c["id"], "body": c["body"]}
+        return 200, {"ETag": etag_of(payload)}, payload
+
+    def delete_comment(self, m, q, h, body):
+        return (204, {}, None) if self.comments.pop(int(m.group(1)), None) else (404, {}, {"message": "Not Found"})
+
+    # ---- workflow runs ----------------------------------------------------
+    def dispatch(self, m, q, h, body):
+        data = json.loads(body or b"{}")
+        inputs = data.get("inputs", {})
+        unexpected = set(inputs) - self.batch_inputs
+        if unexpected:
+            return 422, {}, {"message": f"Unexpected inputs provided: {sorted(unexpected)}"}
+        self.world.clock.after(self.world.scenario.dispatch_lag_s, self.world.start_child, inputs)
+        return 204, {}, None
+
+    def new_run(self, inputs):
+        run_id = next(self._ids)
+        token = inputs.get("dispatch_token", "")
+        title = f"Devin Security Batch {inputs.get('batch_id', '')}" + (f" [{token}]" if token else "")
+        self.runs[run_id] = {
+            "id": run_id,
+            "name": "Devin Security Batch",
+            "display_title": title,
+            "event": "workflow_dispatch",
+            "head_branch": "main",
+            "status": "queued",
+            "conclusion": None,
+            "created_at": iso(self.world.clock.now),
+            "updated_at": iso(self.world.clock.now),
+            "_created": self.world.clock.now,
+        }
+        return run_id
+
+    def _public(self, run):
+        return {k: v for k, v in run.items() if not k.startswith("_")}
+
+    def new_review_run(self, pr_number):
+        run_id = next(self._ids)
+        self.review_runs[run_id] = {
+            "id": run_id,
+            "name": "Devin Security Review",
+            "display_title": f"PR #{pr_number}",
+            "event": "pull_request",
+            "status": "queued",
+            "conclusion": None,
+            "created_at": iso(self.world.clock.now),
+            "updated_at": iso(self.world.clock.now),
+            "_created": self.world.clock.now,
+        }
+        return self.review_runs[run_id]
+
+    def list_review_runs(self, m, q, h, body):
+        if not self.world.scenario.pr_reviews:
+            return 404, {}, {"message": "Not Found"}
+        return self._list_runs(self.review_runs, q)
+
+    def list_runs(self, m, q, h, body):
+        return self._list_runs(self.runs, q)
+
+    def _list_runs(self, all_runs, q):
+        runs = sorted(all_runs.values(), key=lambda r: -r["_created"])
+        created = q.get("created", "")
+        if created.startswith(">="):
+            since = created[2:]
+            since_ts = parse_iso(since) if "T" in since else parse_iso(since + "T00:00:00")
+            runs = [r for r in runs if r["_created"] >= since_ts]
+        if q.get("event"):
+            runs = [r for r in runs if r["event"] == q["event"]]
+        per_page = int(q.get("per_page", 30))
+        page = int(q.get("page", 1))
+        chunk = runs[(page - 1) * per_page: page * per_page]
+        return 200, {}, {"total_count": len(runs), "workflow_runs": [self._public(r) for r in chunk]}
+
+    def get_run(self, m, q, h, body):
+        run = self.runs.get(int(m.group(1)))
+        return (200, {}, self._public(run)) if run else (404, {}, {"message": "Not Found"})
+
+    def add_artifact(self, run_id, name, result):
+        art_id = next(self._ids)
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as z:
+            z.writestr("batch_result.json", json.dumps(result))
+        self.artifacts[art_id] = {
+            "id": art_id,
+            "name": name,
+            "expired": False,
+            "workflow_run": {"id": run_id},
+            "archive_download_url": f"https://api.github.com/repos/{REPO}/actions/artifacts/{art_id}/zip",
+            "_zip": buf.getvalue(),
+        }
+
+    def run_artifacts(self, m, q, h, body):
+        run_id = int(m.group(1))
+        arts = [self._public(a) for a in self.artifacts.values() if a["workflow_run"]["id"] == run_id]
+        return 200, {}, {"total_count": len(arts), "artifacts": arts}
+
+    def list_artifacts(self, m, q, h, body):
+        arts = [self._public(a) for a in sorted(self.artifacts.values(), key=lambda a: -a["id"])]
+        per_page = int(q.get("per_page", 30))
+        return 200, {}, {"total_count": len(arts), "artifacts": arts[:per_page]}
+
+    def download_artifact(self, m, q, h, body):
+        art = self.artifacts.get(int(m.group(1)))
+        return (200, {"Content-Type": "application/zip"}, art["_zip"]) if art else (404, {}, {"message": "Not Found"})
+
+
+    # ---- issues, labels, branches, pulls ----------------------------------
+    def list_issues(self, m, q, h, body):
+        label = q.get("labels", "")
+        issues = [i for i in self.issues.values() if not label or label in i.get("labels", [])]
+        return 200, {}, issues[:int(q.get("per_page", 30))]
+
+    def create_issue(self, m, q, h, body):
+        data = json.loads(body or b"{}")
+        number = max(list(self.issues) + list(self.pulls) + [0]) + 1
+        self.issues[number] = {"number": number, "title": data.get("title", ""), "labels": data.get("labels", [])}
+        return 201, {}, self.issues[number]
+
+    def get_label(self, m, q, h, body):
+        name = unquote(m.group(1))
+        return (200, {}, {"name": name}) if name in self.labels else (404, {}, {"message": "Not Found"})
+
+    def create_label(self, m, q, h, body):
+        name = json.loads(body or b"{}").get("name", "")
+        if name in self.labels:
+            return 422, {}, {"message": "Validation Failed", "errors": [{"code": "already_exists"}]}
+        self.labels.add(name)
+        return 201, {}, {"name": name}
+
+    def add_labels(self, m, q, h, body):
+        target = self.pulls.get(int(m.group(1))) or self.issues.get(int(m.group(1)))
+        if target is None:
+            return 404, {}, {"message": "Not Found"}
+        names = json.loads(body or b"{}").get("labels", [])
+        target.setdefault("labels", []).extend(n for n in names if n not in target.get("labels", []))
+        return 200, {}, [{"name": n} for n in target["labels"]]
+
+    def push_branch(self, name, files):
+        self.branches[name] = sorted(set(self.branches.get(name, [])) | set(files))
+
+    def get_branch(self, m, q, h, body):
+        name = unquote(m.group(1))
+        if name not in self.branches:
+            return 404, {}, {"message": "Branch not found"}
+        return 200, {}, {"name": name, "commit": {"sha": etag_of(name).strip('"')[:40]}}
+
+    def compare(self, m, q, h, body):
+        head = unquote(m.group(2))
+        if head not in self.branches:
+            return 404, {}, {"message": "Not Found"}
+        files = self.branches[head]
+        return 200, {}, {"status": "ahead", "ahead_by": len(files), "total_commits": len(files),
+                         "files": [{"filename": f, "status": "modified"} for f in files]}
+
+    def get_ref(self, m, q, h, body):
+        name = unquote(m.group(1))
+        if name != "main" and name not in self.branches:
+            return 404, {}, {"message": "Not Found"}
+        return 200, {}, {"ref": f"refs/heads/{name}", "object": {"type": "commit", "sha": etag_of(name).strip('"')[:40]}}
+
+    def get_other_ref(self, m, q, h, body):
+        name = unquote(m.group(1))
+        if name not in self.refs:
+            return 404, {}, {"message": "Not Found"}
+        return 200, {}, {"ref": f"refs/{name}", "object": {"type": "commit", "sha": self.refs[name]}}
+
+    def create_ref(self, m, q, h, body):
+        data = json.loads(body or b"{}")
+        if not data.get("ref", "").startswith("refs/heads/"):
+            name = data.get("ref", "").removeprefix("refs/")
+            if name in self.refs:
+                return 422, {}, {"message": "Reference already exists"}
+            self.refs[name] = data.get("sha", "")
+            return 201, {}, {"ref": f"refs/{name}", "object": {"type": "commit", "sha": self.refs[name]}}
+        name = data.get("ref", "").removeprefix("refs/heads/")
+        if name == "main" or name in self.branches:
+            return 422, {}, {"message": "Reference already exists"}
+        self.branches[name] = []
+        return 201, {}, {"ref": f"refs/heads/{name}"}
+
+    def update_ref(self, m, q, h, body):
+        name = unquote(m.group(1))
+        data = json.loads(body or b"{}")
+        if name not in self.refs:
+            return 422, {}, {"message": "Reference does not exist"}
+        if not data.get("force") and self.refs[name] not in self.objects.get(data.get("sha"), {}).get("parents_", []):
+            return 422, {}, {"message": "Update is not a fast forward"}
+        self.refs[name] = data.get("sha", "")
+        return 200, {}, {"ref": f"refs/{name}", "object": {"type": "commit", "sha": self.refs[name]}}
+
+    def _store_object(self, obj):
+        sha = hashlib.sha1(json.dumps(obj, sort_keys=True).encode()).hexdigest()
+        self.objects[sha] = dict(obj, sha=sha)
+        return self.objects[sha]
+
+    def create_tree(self, m, q, h, body):
+        entries = json.loads(body or b"{}").get("tree", [])
+        return 201, {}, self._store_object({"tree": [{k: e[k] for k in ("path", "mode", "type", "sha")} for e in entries]})
+
+    def create_commit(self, m, q, h, body):
+        data = json.loads(body or b"{}")
+        if data.get("tree") not in self.objects:
+            return 422, {}, {"message": "Tree SHA does not exist"}
+        parents = data.get("parents", [])
+        # parents_ (SHAs) backs the fast-forward check; "parents" is the API's shape
+        return 201, {}, self._store_object({"message": data.get("message", ""), "tree": {"sha": data["tree"]},
+                                            "parents": [{"sha": p} for p in parents], "parents_": parents,
+                                            "nonce": next(self._ids)})
+
+    def get_object(self, m, q, h, body):
+        obj = self.objects.get(m.group(1))
+        return (200, {}, obj) if obj else (404, {}, {"message": "Not Found"})
+
+    def create_blob(self, m, q, h, body):
+        content = json.loads(body or b"{}").get("content", "")
+        sha = hashlib.sha1(content.encode()).hexdigest()
+        self.blobs[sha] = content
+        return 201, {}, {"sha": sha}
+
+    def get_blob(self, m, q, h, body):
+        content = self.blobs.get(m.group(1))
+        if content is None:
+            return 404, {}, {"message": "Not Found"}
+        return 200, {}, {"sha": m.group(1), "encoding": "base64", "content": content, "size": len(content)}
+
+    def get_contents(self, m, q, h, body):
+        entry = self.contents.get((q.get("ref", "main"), unquote(m.group(1))))
+        return (200, {}, {"path": unquote(m.group(1)), **entry}) if entry else (404, {}, {"message": "Not Found"})
+
+    def put_contents(self, m, q, h, body):
+        data = json.loads(body or b"{}")
+        key = (data.get("branch", "main"), unquote(m.group(1)))
+        if key[0] != "main" and key[0] not in self.branches:
+            return 404, {}, {"message": "Branch not found"}
+        existing = self.contents.get(key)
+        if existing and data.get("sha") != existing["sha"]:
+            return 422, {}, {"message": "Invalid request.\n\n\"sha\" wasn't supplied."}
+        self.contents[key] = {"sha": etag_of(data.get("content", "")).strip('"')[:40], "content": data.get("content", "")}
+        return (200 if existing else 201), {}, {"content": {"path": key[1], "sha": self.contents[key]["sha"]}}
+
+    def list_pulls(self, m, q, h, body):
+        head = q.get("head", "").split(":")[-1]
+        pulls = [p for p in self.pulls.values()
+                 if (not head or p["head"]["ref"] == head) and p["state"] == q.get("state", "open")]
+        return 200, {}, pulls
+
+    def create_pull(self, m, q, h, body):
+        data = json.loads(body or b"{}")
+        head = data.get("head", "")
+        if head not in self.branches:
+            return 422, {}, {"message": "Validation Failed", "errors": [{"field": "head", "code": "invalid"}]}
+        if any(p["head"]["ref"] == head and p["state"] == "open" for p in self.pulls.values()):
+            return 422, {}, {"message": "Validation Failed", "errors": [{"message": f"A pull request already exists for {head}."}]}
+        number = max(list(self.issues) + list(self.pulls) + [0]) + 1
+        self.pulls[number] = {"number": number, "state": "open", "title": data.get("title", ""),
+                              "body": data.get("body", ""), "head": {"ref": head}, "base": {"ref": data.get("base", "main")},
+                              "html_url": f"https://github.com/{REPO}/pull/{number}", "labels": []}
+        return 201, {}, self.pulls[number]
+
+    def get_pull(self, m, q, h, body):
+        pull = self.pulls.get(int(m.group(1)))
+        return (200, {}, pull) if pull else (404, {}, {"message": "Not Found"})
+
+    def patch_pull(self, m, q, h, body):
+        pull = self.pulls.get(int(m.group(1)))
+        if not pull:
+            return 404, {}, {"message": "Not Found"}
+        pull.update({k: v for k, v in json.loads(body or b"{}").items() if k in ("title", "body", "state")})
+        return 200, {}, pull
+
+
+class DevinModel:
+    def __init__(self, world):
+        self.world = world
+        self.sessions = {}
+        self.creations = []
+        self.cooldown_until = 0.0
+        self.peak_slots = 0
+        self.rejections = {"concurrency": 0, "rate": 0, "prompt": 0}
+        self.attachments = {}         # url -> bytes uploaded
+        self._seq = iter(range(1, 1_000_000))
+        self.router = r = Router()
+        r.add("POST", r"/v1/sessions", self.create, "POST session")
+        r.add("GET", r"/v1/sessions", self.list, "GET sessions")
+        r.add("GET", r"/v1/sessions?/([\w-]+)", self.get, "GET session")
+        r.add("DELETE", r"/v1/sessions?/([\w-]+)", self.delete, "DELETE session")
+        r.add("POST", r"/v1/attachments", self.attach, "POST attachment")
+
+    def slots_held(self):
+        return self.world.scenario.external_sessions + sum(1 for s in self.sessions.values() if not s["released"])
+
+    def create(self, m, q, h, body):
+        sc = self.world.scenario
+        now = self.world.clock.now
+        prompt = json.loads(body or b"{}").get("prompt", "")
+        if len(prompt) >= sc.prompt_limit:
+            self.rejections["prompt"] += 1
+            return 400, {}, {"detail": f"Prompt is too long. Must be less than {sc.prompt_limit} characters."}
+        headers = {}
+        if now < self.cooldown_until:
+            self.rejections["rate"] += 1
+            if sc.send_retry_after:
+                headers["Retry-After"] = str(int(math.ceil(self.cooldown_until - now)))
+            return 429, headers, {"detail": "Rate limit exceeded"}
+        if self.slots_held() >= sc.concurrency_limit:
+            self.rejections["concurrency"] += 1
+            return 429, {}, {"detail": f"You have reached the concurrent session limit of {sc.concurrency_limit}"}
+        self.creations = [t for t in self.creations if now - t < sc.rate_window_s]
+        if len(self.creations) >= sc.rate_threshold:
+            # The budget resets once the cooldown has been served.
+            self.cooldown_until = now + sc.rate_cooldown_s
+            self.creations = []
+            self.rejections["rate"] += 1
+            if sc.send_retry_after:
+                headers["Retry-After"] = str(int(sc.rate_cooldown_s))
+            return 429, headers, {"detail": "Rate limit exceeded"}
+        self.creations.append(now)
+        n_alerts = len(re.findall(r"^\s*- Alert #\d+", prompt, re.M))
+        branch = re.search(r"[Pp]ush all commit\(s\) to branch '([^']+)'", prompt)
+        alert_ids = [int(a) for a in re.findall(r"Alert #(\d+)", prompt)]
+        duration = max(sc.session_min_s,
+                       self.world.rng.gauss(sc.session_mean_s + sc.session_per_alert_s * n_alerts, sc.session_sd_s))
+        sid = f"devin-{next(self._seq):05d}"
+        self.sessions[sid] = {"id": sid, "created": now, "end": now + duration, "alerts": n_alerts,
+                              "released": False, "terminated": False}
+        self.peak_slots = max(self.peak_slots, self.slots_held())
+        if branch:
+            gh = self.world.github
+            files = [gh.alerts[a]["most_recent_instance"]["location"]["path"] for a in alert_ids if a in gh.alerts]
+            self.world.clock.schedule(now + duration, gh.push_branch, branch.group(1), files)
+        self.world.log_event("session_created", sid=sid, alerts=n_alerts, duration=int(duration))
+        return 200, {}, {"session_id": sid, "url": f"https://app.devin.ai/sessions/{sid}", "is_new_session": True}
+
+    def attach(self, m, q, h, body):
+        name = re.search(rb'filename="([^"]+)"', body or b"")
+        if not name:
+            return 422, {}, {"detail": "file is required"}
+        url = f"https://devin-public-attachments.s3.amazonaws.com/attachments/{len(self.attachments) + 1:05d}/{name.group(1).decode()}"
+        self.attachments[url] = len(body)
+        return 200, {}, url
+
+    def status(self, sid):
+        s = self.sessions[sid]
+        if s["terminated"]:
+            return "stopped"
+        return "finished" if self.world.clock.now >= s["end"] else "running"
+
+    def list(self, m, q, h, body):
+        return 200, {}, {"sessions": [{"session_id": s["id"], "status_enum": self.status(s["id"])}
+                                      for s in self.sessions.values() if not s["released"]]}
+
+    def get(self, m, q, h, body):
+        sid = m.group(1)
+        if sid not in self.sessions:
+            return 404, {}, {"detail": "Session not found"}
+        s = self.sessions[sid]
+        st = self.status(sid)
+        return 200, {}, {"session_id": sid, "status": st, "status_enum": st, "created_at": iso(s["created"])}
+
+    def delete(self, m, q, h, body):
+        sid = m.group(1)
+        if sid not in self.sessions:
+            return 404, {}, {"detail": "Session not found"}
+        self.terminate(sid)
+        return 200, {}, {"detail": "Session terminated"}
+
+    def terminate(self, sid):
+        s = self.sessions[sid]
+        s["terminated"] = True
+        self.release(sid)
+
+    def release(self, sid):
+        s = self.sessions[sid]
+        if not s["released"]:
+            s["released"] = True
+            self.world.log_event("slot_released", sid=sid)
@@ -0,0 +1,18 @@
+"""Record the API traffic of every Python step into a replayable cassette.
+
+The backlog workflow puts this directory on PYTHONPATH and sets
+BACKLOG_API_CASSETTE when its `record_api_traffic` input is true. Python
+imports sitecustomize at startup, so each step's urlopen/curl calls are
+captured without changing the steps. replay.py is loaded by path to keep the
+backlog_sim package (and its PyYAML import) out of the recorded process.
+"""
+import os
+
+if os.environ.get("BACKLOG_API_CASSETTE"):
+    import importlib.util
+
+    _spec = importlib.util.spec_from_file_location(
+        "_backlog_replay", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "replay.py"))
+    _replay = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(_replay)
+    _replay.install_recorder(os.environ["BACKLOG_API_CASSETTE"])
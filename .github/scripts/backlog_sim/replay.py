@@ -0,0 +1,273 @@
+"""Record and replay API traffic.
+
+Recording: with BACKLOG_API_CASSETTE set and record/ on PYTHONPATH (the
+backlog workflow's `record_api_traffic` input does both), every Python step
+of a real run appends its urllib and curl exchanges to a JSONL cassette.
+Request headers are never written; long request strings (prompts) are
+reduced to their length.
+
+Replay: `python3 -m backlog_sim.replay api-cassette.jsonl` runs the current
+orchestrator steps against the cassette on a virtual clock that starts at
+the recorded start time. Reads are time-indexed: a GET is answered with the
+latest recorded response for the same request at or before the current
+replay time, so a changed orchestrator that polls at different moments still
+sees the world as it was then. Writes are answered in recorded order.
+Requests the recording never made are reported as misses (404).
+
+This module is stdlib-only: record/sitecustomize.py loads it by path.
+"""
+import base64
+import io
+import json
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+VOLATILE_PARAMS = {"created"}          # run listings are narrowed by a time-derived bound
+PLACEHOLDER = "{{api}}"
+HEADERS_KEPT = ("content-type", "etag", "link", "retry-after")
+ENV_KEPT = ("GITHUB_REPOSITORY", "MAX_CONCURRENT", "MAX_BATCHES", "ALERTS_PER_BATCH", "POLL_INTERVAL",
+            "MAX_CHILD_RUNTIME", "SAFETY_TIMEOUT", "BATCH_PLANNER", "DEVIN_CONCURRENCY_LIMIT",
+            "CREATION_THRESHOLD", "CREATION_COOLDOWN")
+
+
+def request_key(method, url):
+    """METHOD /path?query with the repo slug and volatile params normalized."""
+    parts = urlsplit(url)
+    path = re.sub(r"^/repos/[^/]+/[^/]+", "/repos/{repo}", parts.path)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in VOLATILE_PARAMS)
+    return f"{method.upper()} {path}" + (f"?{urlencode(query)}" if query else "")
+
+
+def _base(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _summarize_request(body):
+    if not body:
+        return None
+    try:
+        data = json.loads(body)
+    except (ValueError, TypeError):
+        return {"bytes": len(body)}
+
+    def shrink(v):
+        if isinstance(v, str) and len(v) > 500:
+            return f"<{len(v)} chars>"
+        if isinstance(v, dict):
+            return {k: shrink(x) for k, x in v.items()}
+        return v
+    return shrink(data)
+
+
+def parse_curl_args(args):
+    """(method, url, headers, data, out_path, write_fmt) from a curl argv."""
+    method, out_path, write_fmt, headers, data, url = "GET", None, "", {}, None, ""
+    it = iter(args[1:])
+    for a in it:
+        if a in ("-o", "--output"):
+            out_path = next(it)
+        elif a in ("-w", "--write-out"):
+            write_fmt = next(it)
+        elif a in ("-X", "--request"):
+            method = next(it)
+        elif a in ("-H", "--header"):
+            k, _, v = next(it).partition(":")
+            headers[k.strip()] = v.strip()
+        elif a in ("-d", "--data", "--data-binary"):
+            data = next(it).encode()
+            method = "POST" if method == "GET" else method
+        elif a.startswith("http"):
+            url = a
+    return method, url, headers, data, out_path, write_fmt
+
+
+class CassetteWriter:
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, t, method, url, body, status, headers, data):
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        base = _base(url)
+        parts = urlsplit(url)
+        try:
+            text, b64 = data.decode().replace(base, PLACEHOLDER), False
+        except UnicodeDecodeError:
+            text, b64 = base64.b64encode(data).decode(), True
+        entry = {
+            "t": t,
+            "method": method.upper(),
+            "url": parts.path + (f"?{parts.query}" if parts.query else ""),
+            "request": _summarize_request(body),
+            "status": status,
+            "headers": {k: v.replace(base, PLACEHOLDER) for k, v in (headers or {}).items() if k.lower() in HEADERS_KEPT},
+            "body": text,
+            "b64": b64,
+        }
+        with open(self.path, "a") as f:
+            if new:
+                f.write(json.dumps({"cassette": 1, "start": t, "env": {k: os.environ[k] for k in ENV_KEPT if k in os.environ}}) + "\n")
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+class Cassette:
+    def __init__(self, header, entries):
+        self.header = header
+        self.start = float(header["start"])
+        self.env = header.get("env", {})
+        self.entries = entries
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        header, entries = lines[0], lines[1:]
+        for e in entries:
+            e["rel"] = e["t"] - float(header["start"])
+        return cls(header, entries)
+
+
+class ReplayTransport:
+    """Answers requests from a Cassette; same signature as World.request."""
+
+    def __init__(self, cassette, clock):
+        self.cassette = cassette
+        self.clock = clock
+        self.by_key = defaultdict(list)
+        for e in cassette.entries:
+            self.by_key[request_key(e["method"], e["url"])].append(e)
+        self.cursor = Counter()
+        self.aliases = {}
+        self.misses = Counter()
+        self.served = 0
+
+    def _pick(self, key, method, headers):
+        entries = self.by_key.get(key)
+        if not entries:
+            return None
+        if method != "GET":
+            i = min(self.cursor[key], len(entries) - 1)
+            self.cursor[key] += 1
+            return entries[i]
+        rel = self.clock.now - self.cassette.start
+        conditional = any(k.lower() == "if-none-match" for k in (headers or {}))
+        candidates = [e for e in entries if conditional or e["status"] != 304] or entries
+        past = [e for e in candidates if e["rel"] <= rel]
+        return past[-1] if past else candidates[0]
+
+    def __call__(self, method, url, headers=None, body=None):
+        key = request_key(method, url)
+        entry = self._pick(key, method.upper(), headers)
+        if entry is None:
+            self.misses[key] += 1
+            return 404, {"Content-Type": "application/json"}, b'{"message": "Not recorded in cassette"}'
+        self.served += 1
+        # The replayed run generates its own dispatch tokens; map the
+        # recorded ones so run-name matching still resolves.
+        recorded = ((entry.get("request") or {}).get("inputs") or {}).get("dispatch_token")
+        if recorded and body:
+            current = (json.loads(body).get("inputs") or {}).get("dispatch_token")
+            if current:
+                self.aliases[recorded] = current
+        base = _base(url)
+        data = base64.b64decode(entry["body"]) if entry["b64"] else entry["body"].replace(PLACEHOLDER, base).encode()
+        for old, new in self.aliases.items():
+            data = data.replace(old.encode(), new.encode())
+        resp_headers = {k: v.replace(PLACEHOLDER, base) for k, v in entry["headers"].items()}
+        return entry["status"], resp_headers, data
+
+
+def install_recorder(path):
+    """Patch urllib.request.urlopen and subprocess.run (curl) in this
+    process so every exchange is appended to the cassette at `path`."""
+    import subprocess
+    import urllib.error
+    import urllib.request
+    import urllib.response
+
+    writer = CassetteWriter(path)
+    real_urlopen = urllib.request.urlopen
+    real_run = subprocess.run
+
+    def urlopen(req, data=None, *args, **kwargs):
+        r = req if isinstance(req, urllib.request.Request) else urllib.request.Request(req, data=data)
+        body = r.data if r.data is not None else data
+        # Entries are stamped when the answer arrives: replay serves the
+        # state the API reported, and that is when it reported it.
+        try:
+            resp = real_urlopen(req, data, *args, **kwargs)
+        except urllib.error.HTTPError as e:
+            payload = e.read()
+            writer.write(time.time(), r.get_method(), r.full_url, body, e.code, dict(e.headers or {}), payload)
+            raise urllib.error.HTTPError(e.url, e.code, e.msg, e.hdrs, io.BytesIO(payload)) from None
+        payload = resp.read()
+        writer.write(time.time(), r.get_method(), r.full_url, body, resp.status, dict(resp.headers), payload)
+        return urllib.response.addinfourl(io.BytesIO(payload), resp.headers, resp.url, resp.status)
+
+    def run(args, *a, **kw):
+        result = real_run(args, *a, **kw)
+        if isinstance(args, (list, tuple)) and args and os.path.basename(str(args[0])) == "curl":
+            method, url, _, data, out_path, write_fmt = parse_curl_args(list(args))
+            out = result.stdout if isinstance(result.stdout, str) else (result.stdout or b"").decode(errors="replace")
+            m = re.search(r"(\d{3})\s*$", out) if "%{http_code}" in write_fmt else None
+            status = int(m.group(1)) if m else 200
+            payload = b""
+            if out_path and out_path != "/dev/null" and os.path.exists(out_path):
+                with open(out_path, "rb") as f:
+                    payload = f.read()
+            writer.write(time.time(), method, url, data, status, {}, payload)
+        return result
+
+    urllib.request.urlopen = urlopen
+    subprocess.run = run
+
+
+def main():
+    import argparse
+
+    from .clock import VirtualClock
+    from .models import Scenario
+    from .runner import simulate
+
+    p = argparse.ArgumentParser(prog="backlog_sim.replay", description="Replay a recorded orchestrator run offline.")
+    p.add_argument("cassette")
+    p.add_argument("--alerts-per-batch", help="override the recorded ALERTS_PER_BATCH")
+    p.add_argument("--max-concurrent", type=int, help="override the recorded MAX_CONCURRENT")
+    p.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra job env override")
+    p.add_argument("--keep", action="store_true")
+    args = p.parse_args()
+
+    cassette = Cassette.load(args.cassette)
+    env = dict(cassette.env)
+    env.pop("GITHUB_REPOSITORY", None)
+    env.update(dict(kv.split("=", 1) for kv in args.env))
+    scenario = Scenario(
+        name="replay",
+        alerts_per_batch=args.alerts_per_batch or env.pop("ALERTS_PER_BATCH", "15"),
+        max_concurrent=args.max_concurrent or int(env.pop("MAX_CONCURRENT", "3")),
+        max_batches=int(env.pop("MAX_BATCHES", "0")),
+        env=env,
+    )
+    holder = {}
+
+    def make_transport(world):
+        holder["t"] = ReplayTransport(cassette, world.clock)
+        return holder["t"]
+
+    metrics = simulate(scenario, keep=args.keep, make_transport=make_transport, clock=VirtualClock(cassette.start))
+    metrics.pop("events", None)
+    for k in ("dispatched", "sessions_created", "rejected_429", "rejected_prompt", "peak_slots", "api_calls",
+              "calls", "faults_fired"):
+        metrics.pop(k, None)   # model counters; the cassette answered instead
+    replay = holder["t"]
+    metrics["recorded_wall_s"] = round(cassette.entries[-1]["rel"], 1) if cassette.entries else 0
+    metrics["replayed"] = replay.served
+    metrics["misses"] = dict(replay.misses)
+    print(json.dumps(metrics, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Drive one simulated Devin Security Backlog run, step by step.
+
+The Python steps of devin-security-backlog.yml run as written; the bash-only
+steps (health check, tracking issue) are replayed here because they only
+move data between files.
+"""
+import glob
+import json
+import os
+import re
+import shutil
+import tempfile
+import time as real_time
+
+from .models import REPO
+from .sandbox import Shims, find_heredoc, input_names, load_function, load_workflow, run_step
+from .world import OrgPeer, World
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+BACKLOG_WF = os.path.join(ROOT, ".github", "workflows", "devin-security-backlog.yml")
+BATCH_WF = os.path.join(ROOT, ".github", "workflows", "devin-security-batch.yml")
+
+ISSUE_NUMBER = 1
+RUN_ID = 22000000001
+
+_DEFAULT_EXPR = re.compile(r"\$\{\{\s*([\w.]+)\s*\|\|\s*'([^']*)'\s*\}\}")
+
+
+def alert_paths(limit):
+    """Real source files in this repo, so the planner's file-size cost
+    factor sees the same inputs it would in CI. Larger projections get
+    extra (nonexistent, size factor 1.0) paths so files stay small enough
+    to batch."""
+    paths = sorted(os.path.relpath(p, ROOT) for p in glob.glob(os.path.join(ROOT, "app", "**", "*.py"), recursive=True))
+    paths = [p for p in paths if not p.endswith("__init__.py")] or ["app/main.py"]
+    paths += [f"app/generated/module_{i:04d}.py" for i in range(max(0, limit - len(paths)))]
+    return paths[:limit] if limit else paths
+
+
+def job_env(workflow, scenario):
+    """The orchestrate job's env block with workflow_dispatch inputs filled
+    in from the scenario."""
+    inputs = {
+        "max_concurrent": str(scenario.max_concurrent),
+        "max_batches": str(scenario.max_batches),
+        "alerts_per_batch": str(scenario.alerts_per_batch),
+        "dry_run": "false",
+        "reset_cursor": "false",
+    }
+    env = {}
+    for key, value in workflow["jobs"]["orchestrate"].get("env", {}).items():
+        value = str(value)
+        m = _DEFAULT_EXPR.fullmatch(value.strip())
+        if m:
+            name = m.group(1).rpartition(".")[2]
+            value = inputs.get(name, m.group(2)) if m.group(1).startswith("github.event.inputs.") else m.group(2)
+        elif "${{" in value:
+            value = "main"
+        env[key] = value
+    env.update({
+        "POLL_INTERVAL": str(scenario.poll_interval),
+        "MAX_CHILD_RUNTIME": str(scenario.max_child_runtime),
+        "SAFETY_TIMEOUT": str(scenario.safety_timeout),
+    })
+    env.update({k: str(v) for k, v in scenario.env.items()})
+    return env
+
+
+def _cursor_comment(cursor):
+    # A v1 cursor (plain lists) — the parse step handles both formats.
+    return "<!-- backlog-cursor -->\n```json\n" + json.dumps(cursor) + "\n```"
+
+
+def simulate(scenario, workdir=None, keep=False, make_transport=None, clock=None):
+    """Run the orchestrator against a simulated world and return metrics.
+    `make_transport(world)` may supply a different request handler (e.g. a
+    cassette replay); by default requests go to the world's API models."""
+    wall_start = real_time.monotonic()
+    backlog = load_workflow(BACKLOG_WF)
+    batch = load_workflow(BATCH_WF)
+    scratch = workdir or tempfile.mkdtemp(prefix=f"backlog-sim-{scenario.name}-")
+    os.makedirs(os.path.join(scratch, "home"), exist_ok=True)
+    world = World(scenario, input_names(batch), alert_paths(scenario.files), clock=clock)
+    transport = make_transport(world) if make_transport else world.request
+    shims = Shims(world, transport)
+    env = dict(job_env(backlog, scenario),
+               GITHUB_REPOSITORY=REPO, GITHUB_RUN_ID=str(RUN_ID),
+               GITHUB_SERVER_URL="https://github.com", GITHUB_API_URL="https://api.github.com",
+               GH_PAT="sim-gh-token", DEVIN_API_KEY="sim-devin-key",
+               PYTHONUNBUFFERED="1", PATH=os.environ.get("PATH", ""))
+    peers = []
+    if scenario.org_peers:
+        names = [f"octo-org/peer-{i + 1}" for i in range(scenario.org_peers)]
+        env["ORG_REPOS"] = ",".join([REPO] + names)
+        fair_shares = load_function(find_heredoc(backlog, "ORCHESTRATE_EOF")[1], "fair_shares")
+        for name in names:
+            peers.append(OrgPeer(world, name, env["ORG_LEDGER_REF"], fair_shares, limit=int(env["DEVIN_CONCURRENCY_LIMIT"]),
+                                 capacity=int(env["CREATION_THRESHOLD"]), window=int(env["CREATION_COOLDOWN"]),
+                                 ttl=int(env["ORG_LEASE_TTL"])))
+            peers[-1].start()
+    log_path = os.path.join(scratch, "orchestrator.log")
+    steps = {}
+    with open(log_path, "w") as log:
+        def step(tag, **extra):
+            _, source = find_heredoc(backlog, tag)
+            code, outputs = run_step(shims, source, tag, scratch, dict(env, **extra), ROOT, log)
+            steps[tag] = {"exit_code": code, "outputs": outputs}
+            return outputs
+
+        def run_workflow(run_id):
+            fetch = step("FETCH_EOF", GITHUB_RUN_ID=str(run_id))
+            if fetch.get("skip") == "true":
+                return
+            # Find or create tracking issue (bash): the issue exists.
+            cursor_out = step("CURSOR_PARSE_EOF", ISSUE_NUM=str(ISSUE_NUMBER))
+            if steps["CURSOR_PARSE_EOF"]["exit_code"]:
+                return  # a failed step skips the rest of the job
+            batch_out = step("BATCH_EOF", FETCH_COMPLETE=fetch.get("fetch_complete", "true"))
+            if batch_out.get("batch_count") == "0" and batch_out.get("resume_count", "0") == "0":
+                return
+            config = step("CONFIG_EOF")
+            step("ORCHESTRATE_EOF",
+                 GITHUB_RUN_ID=str(run_id),
+                 ISSUE_NUM=str(ISSUE_NUMBER),
+                 CURSOR_COMMENT_ID=cursor_out.get("cursor_comment_id", ""),
+                 STATE_VERSION=cursor_out.get("state_version", ""),
+                 CODEQL_LANGUAGES=config.get("languages", ""),
+                 CODEQL_QUERY_SUITE=config.get("query_suite", ""),
+                 CODEQL_THREAT_MODELS=config.get("threat_models", ""),
+                 CODEQL_CONFIG_SOURCE=config.get("codeql_config_source", ""))
+
+        if scenario.cursor:
+            transport("POST", f"https://api.github.com/repos/{REPO}/issues/{ISSUE_NUMBER}/comments", {},
+                      json.dumps({"body": _cursor_comment(scenario.cursor)}).encode())
+        if scenario.crash_at_s:
+            shims.kill_at = world.started_at + scenario.crash_at_s
+        run_workflow(RUN_ID)
+        shims.kill_at = None
+        if steps.get("ORCHESTRATE_EOF", {}).get("exit_code") == 137:
+            # The runner was lost: the next workflow run starts on the same world
+            steps["ORCHESTRATE_EOF (lost runner)"] = steps.pop("ORCHESTRATE_EOF")
+            world.clock.sleep(scenario.restart_delay_s)
+            run_workflow(RUN_ID + 1)
+
+    metrics = collect_metrics(scenario, world, scratch, steps)
+    if scenario.pr_reviews:
+        waits = [r["waited_s"] for r in world.pr_reviews if r["waited_s"] is not None]
+        metrics["pr_reviews"] = {"started": len(world.pr_reviews), "failed": sum(1 for r in world.pr_reviews if r["ok"] is False),
+                                 "retried": sum(1 for r in world.pr_reviews if r["attempts"] > 1),
+                                 "max_wait_s": max(waits, default=0.0)}
+    if peers:
+        metrics["peers"] = {p.name: {"sessions": p.sessions, "done_s": round(p.done_at - world.started_at, 1) if p.done_at else None}
+                            for p in peers}
+    metrics["events"] = world.events
+    metrics["sim_cpu_s"] = round(real_time.monotonic() - wall_start, 2)
+    metrics["log"] = log_path if keep else None
+    if not keep and workdir is None:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return metrics
+
+
+def collect_metrics(scenario, world, scratch, steps):
+    out = steps.get("ORCHESTRATE_EOF", {}).get("outputs", {})
+    batches = []
+    path = os.path.join(scratch, "batches.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            batches = json.load(f)
+    return {
+        "scenario": scenario.name,
+        "wall_s": round(world.clock.now - world.started_at, 1),
+        "observed_wall_s": scenario.observed_wall_s or None,
+        "batches": len(batches),
+        "alerts_per_batch": max((len(b["alert_ids"]) for b in batches), default=0),
+        "dispatched": len(world.github.runs),
+        "completed": int(out.get("completed_count", 0) or 0),
+        "failed": int(out.get("failed_count", 0) or 0),
+        "remaining": int(out.get("remaining_count", 0) or 0),
+        "resumed": int(out.get("resumed_count", 0) or 0),
+        "sessions_created": sum(1 for s in world.devin.sessions.values() if "holder" not in s),
+        "rejected_429": world.devin.rejections["concurrency"] + world.devin.rejections["rate"],
+        "rejected_prompt": world.devin.rejections["prompt"],
+        "peak_slots": world.devin.peak_slots,
+        "api_calls": sum(world.calls.values()),
+        "calls": dict(sorted(world.calls.items())),
+        "exit_codes": {tag: s["exit_code"] for tag, s in steps.items()},
+        "faults_fired": len(world.faults.fired) if world.faults else 0,
+    }
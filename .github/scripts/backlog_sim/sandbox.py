@@ -0,0 +1,248 @@
+"""Run the workflow's inline Python steps unmodified under simulation.
+
+Each step's heredoc (`python3 << 'TAG' ... TAG`) is extracted from the YAML
+and exec'd with:
+  - /tmp/ paths redirected to a per-run scratch directory
+  - the step's environment (job env + step env) in os.environ
+  - `time`, `urllib.request`, `subprocess`, `signal`, `atexit` and `uuid`
+    swapped for shims bound to the simulated world, via a private __import__
+    so the simulator's own modules are unaffected
+Nothing in the workflow source is patched; a change to the YAML is a change
+to what gets simulated.
+
+A step can be killed at a virtual time (Shims.kill_at): the next sleep past
+it raises RunnerKilled, which skips atexit handlers the way a lost runner
+does, and the step exits 137.
+"""
+import builtins
+import email.message
+import io
+import os
+import random
+import re
+import subprocess as real_subprocess
+import sys
+import time as real_time
+import types
+import urllib.error
+import urllib.parse
+import urllib.request as real_request
+import uuid as real_uuid
+from contextlib import redirect_stdout
+
+import yaml
+
+HEREDOC_RE = r"python3[^\n]*<<\s*'{tag}'\n(.*?)\n\s*{tag}\s*$"
+
+
+def load_workflow(path):
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def find_heredoc(workflow, tag):
+    """Return (step, source) for the step whose run block holds heredoc `tag`."""
+    for job in workflow["jobs"].values():
+        for step in job["steps"]:
+            run = step.get("run", "")
+            m = re.search(HEREDOC_RE.format(tag=tag), run, re.S | re.M)
+            if m:
+                lines = m.group(1).split("\n")
+                indent = min((len(l) - len(l.lstrip()) for l in lines if l.strip()), default=0)
+                return step, "\n".join(l[indent:] for l in lines)
+    raise KeyError(f"heredoc {tag!r} not found")
+
+
+def load_function(source, name):
+    """Compile the top-level function `name` out of a heredoc's source, for
+    simulated actors that must follow the same rule as the workflow (e.g.
+    the org fair-share split). It may only use builtins."""
+    import ast
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.FunctionDef) and node.name == name:
+            namespace = {}
+            exec(compile(ast.Module(body=[node], type_ignores=[]), f"<{name}>", "exec"), namespace)
+            return namespace[name]
+    raise KeyError(f"function {name!r} not found")
+
+
+def input_names(workflow):
+    on = workflow.get("on", workflow.get(True, {}))
+    return list((on.get("workflow_dispatch") or {}).get("inputs", {}).keys())
+
+
+class _Headers(email.message.Message):
+    pass
+
+
+def _headers(d):
+    h = _Headers()
+    for k, v in d.items():
+        h[k] = v
+    return h
+
+
+class _Response(io.BytesIO):
+    def __init__(self, url, status, headers, body):
+        super().__init__(body)
+        self.url = url
+        self.status = self.code = status
+        self.headers = self.msg = _headers(headers)
+
+    def getcode(self):
+        return self.status
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def info(self):
+        return self.headers
+
+
+class RunnerKilled(BaseException):
+    """The runner died mid-step (BaseException, so the step's own handlers
+    don't catch it)."""
+
+
+class Shims:
+    """Module stand-ins bound to one World."""
+
+    def __init__(self, world, transport):
+        self.world = world
+        self.transport = transport
+        self.exit_handlers = []
+        self.kill_at = None
+        self.time = self._time_module()
+        self.request = self._request_module()
+        self.urllib = types.SimpleNamespace(request=self.request, error=urllib.error, parse=urllib.parse)
+        self.subprocess = self._subprocess_module()
+        self.signal = types.SimpleNamespace(SIGTERM=15, SIGINT=2, signal=lambda *a, **k: None)
+        self.atexit = types.SimpleNamespace(register=self._register)
+        rng = random.Random(world.scenario.seed * 7919)
+        self.uuid = types.SimpleNamespace(uuid4=lambda: real_uuid.UUID(int=rng.getrandbits(128), version=4),
+                                          UUID=real_uuid.UUID)
+
+    def _register(self, fn, *args, **kwargs):
+        self.exit_handlers.append((fn, args, kwargs))
+        return fn
+
+    def run_exit_handlers(self):
+        while self.exit_handlers:
+            fn, args, kwargs = self.exit_handlers.pop()
+            fn(*args, **kwargs)
+
+    def _time_module(self):
+        clock = self.world.clock
+        mod = types.ModuleType("time")
+        mod.__dict__.update({k: getattr(real_time, k) for k in dir(real_time) if not k.startswith("__")})
+        mod.time = lambda: clock.now
+        mod.monotonic = mod.perf_counter = lambda: clock.now
+        def sleep(seconds):
+            clock.sleep(seconds)
+            if self.kill_at is not None and clock.now >= self.kill_at:
+                raise RunnerKilled()
+
+        mod.sleep = sleep
+        mod.gmtime = lambda secs=None: real_time.gmtime(clock.now if secs is None else secs)
+        mod.localtime = mod.gmtime
+        mod.strftime = lambda fmt, t=None: real_time.strftime(fmt, t if t is not None else real_time.gmtime(clock.now))
+        return mod
+
+    def _request_module(self):
+        mod = types.ModuleType("urllib.request")
+        mod.__dict__.update({k: getattr(real_request, k) for k in dir(real_request) if not k.startswith("__")})
+
+        def urlopen(req, data=None, timeout=None, **kwargs):
+            if isinstance(req, str):
+                req = real_request.Request(req, data=data)
+            body = req.data if req.data is not None else data
+            status, headers, payload = self.transport(req.get_method(), req.full_url, dict(req.header_items()), body)
+            if status >= 400:
+                raise urllib.error.HTTPError(req.full_url, status, "HTTP %d" % status, _headers(headers), io.BytesIO(payload))
+            if status == 304:
+                # urllib surfaces 304 as an HTTPError as well
+                raise urllib.error.HTTPError(req.full_url, status, "Not Modified", _headers(headers), io.BytesIO(b""))
+            return _Response(req.full_url, status, headers, payload)
+
+        mod.urlopen = urlopen
+        return mod
+
+    def _subprocess_module(self):
+        mod = types.ModuleType("subprocess")
+        mod.__dict__.update({k: getattr(real_subprocess, k) for k in dir(real_subprocess) if not k.startswith("__")})
+
+        def run(args, capture_output=False, text=False, timeout=None, check=False, **kwargs):
+            if not args or os.path.basename(args[0]) != "curl":
+                raise RuntimeError(f"simulator: unsupported subprocess {args[:1]}")
+            from .replay import parse_curl_args
+            method, url, headers, data, out_path, write_fmt = parse_curl_args(args)
+            status, _, payload = self.transport(method, url, headers, data)
+            if out_path and out_path != "/dev/null":
+                with open(out_path, "wb") as f:
+                    f.write(payload)
+            stdout = write_fmt.replace("%{http_code}", str(status))
+            if not out_path:
+                stdout = payload.decode(errors="replace") + stdout
+            if check and status >= 400 and "-f" in args:
+                raise real_subprocess.CalledProcessError(22, args)
+            return real_subprocess.CompletedProcess(args, 0, stdout if text else stdout.encode(), "" if text else b"")
+
+        mod.run = run
+        return mod
+
+    def importer(self):
+        overrides = {"time": self.time, "subprocess": self.subprocess, "signal": self.signal,
+                     "atexit": self.atexit, "uuid": self.uuid}
+
+        def sim_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if name in overrides:
+                return overrides[name]
+            if name == "urllib.request" and fromlist:
+                return self.request
+            if name in ("urllib", "urllib.request", "urllib.error") and not fromlist:
+                return self.urllib
+            return builtins.__import__(name, globals, locals, fromlist, level)
+
+        return sim_import
+
+
+def run_step(shims, source, tag, scratch, env, cwd, log_file):
+    """Exec one heredoc. Returns (exit_code, outputs) where outputs are the
+    key=value lines the step appended to $GITHUB_OUTPUT."""
+    out_path = os.path.join(scratch, f"github_output_{tag}")
+    open(out_path, "w").close()
+    code = compile(source.replace("/tmp/", scratch.rstrip("/") + "/"), f"<{tag}>", "exec")
+    g = {"__name__": "__main__", "__builtins__": dict(builtins.__dict__, __import__=shims.importer())}
+    saved_env, saved_cwd = dict(os.environ), os.getcwd()
+    os.environ.clear()
+    os.environ.update({k: str(v) for k, v in env.items()})
+    os.environ.update({"GITHUB_OUTPUT": out_path, "HOME": os.path.join(scratch, "home")})
+    os.chdir(cwd)
+    exit_code = 0
+    stdout = sys.stdout
+    try:
+        with redirect_stdout(log_file):
+            print(f"\n##[step] {tag}")
+            try:
+                exec(code, g)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except RunnerKilled:
+                print(f"##[error] runner lost at t={shims.world.clock.now - shims.world.started_at:.0f}s")
+                shims.exit_handlers.clear()
+                exit_code = 137
+            finally:
+                shims.run_exit_handlers()
+    finally:
+        log_file.flush()
+        sys.stdout = stdout
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+    outputs = {}
+    with open(out_path) as f:
+        for line in f:
+            k, sep, v = line.rstrip("\n").partition("=")
+            if sep:
+                outputs[k] = v
+    return exit_code, outputs
@@ -0,0 +1,180 @@
+"""Local HTTP stand-ins for the GitHub and Devin APIs.
+
+Serves the same models the simulator uses (or a recorded cassette) over
+HTTP, so the workflows' own bash/curl and Python steps can be run locally
+against them by pointing GITHUB_API_URL and DEVIN_API_URL at this server:
+
+    cd .github/scripts
+    python3 -m backlog_sim.server --port 8750 --speed 60 --faults plan.json
+    export GITHUB_API_URL=http://127.0.0.1:8750 DEVIN_API_URL=http://127.0.0.1:8750
+
+One port serves both APIs: /v1/... goes to the Devin model, everything else
+to the GitHub model. Modeled time runs `--speed` times faster than the wall
+clock (a 15 min session finishes in 15 s at --speed 60); scale the client's
+POLL_INTERVAL the same way. Injected latency is real, divided by --speed.
+
+Control endpoints (not part of either API):
+    GET  /_standin/state             call counts, faults fired, events
+    POST /_standin/advance?seconds=N jump modeled time forward
+    POST /_standin/faults            replace the fault plan (JSON list)
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .clock import VirtualClock
+from .faults import FaultInjector
+from .models import Scenario
+from .replay import Cassette, ReplayTransport
+from .runner import BATCH_WF, alert_paths
+from .sandbox import input_names, load_workflow
+from .world import World
+
+
+class StandIn:
+    """A World (or cassette) behind a lock, with modeled time slaved to the
+    wall clock at `speed`x."""
+
+    def __init__(self, scenario, speed=1.0, cassette=None, record=None):
+        self.speed = float(speed)
+        self.lock = threading.RLock()
+        self.clock = VirtualClock(start=cassette.start if cassette else time.time())
+        self._real_start = time.monotonic()
+        self._virtual_start = self.clock.now
+        self.world = World(scenario, input_names(load_workflow(BATCH_WF)), alert_paths(scenario.files),
+                           clock=self.clock, sleep=self._real_sleep)
+        self.transport = ReplayTransport(cassette, self.clock) if cassette else self.world.transport
+        self.record = record
+        self._stop = threading.Event()
+
+    def _real_sleep(self, seconds):
+        time.sleep(seconds / self.speed)
+
+    def tick(self):
+        with self.lock:
+            self.clock.advance_to(self._virtual_start + (time.monotonic() - self._real_start) * self.speed)
+
+    def pump(self, interval=0.02):
+        while not self._stop.wait(interval):
+            self.tick()
+
+    def handle(self, method, url, headers, body):
+        time.sleep(self.world.latency(url) / self.speed)
+        with self.lock:
+            self.tick()
+            status, resp_headers, data = self.transport(method, url, headers, body)
+            if self.record:
+                self.record.write(self.clock.now, method, url, body, status, resp_headers, data)
+            return status, resp_headers, data
+
+    def control(self, method, path, query, body):
+        with self.lock:
+            if path == "/_standin/state":
+                w = self.world
+                return 200, {
+                    "now": self.clock.now,
+                    "calls": dict(w.calls),
+                    "statuses": dict(w.statuses),
+                    "faults_fired": w.faults.fired if w.faults else [],
+                    "replay_misses": getattr(self.transport, "misses", None),
+                    "sessions_held": w.devin.slots_held(),
+                    "events": w.events[-200:],
+                }
+            if path == "/_standin/advance" and method == "POST":
+                seconds = float(query.get("seconds", ["0"])[-1])
+                self._virtual_start += seconds
+                self.tick()
+                return 200, {"now": self.clock.now}
+            if path == "/_standin/faults" and method == "POST":
+                w = self.world
+                w.faults = FaultInjector(json.loads(body or b"[]"), self.clock, w.scenario.seed, self._real_sleep)
+                w.transport = w.faults.wrap(w.answer)
+                if not isinstance(self.transport, ReplayTransport):
+                    self.transport = w.transport
+                return 200, {"rules": len(w.faults.rules)}
+        return 404, {"message": "Unknown control endpoint"}
+
+
+def make_handler(standin, base_url):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _serve(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else None
+            parts = urlsplit(self.path)
+            if parts.path.startswith("/_standin/"):
+                status, payload = standin.control(self.command, parts.path, parse_qs(parts.query), body)
+                data, headers = json.dumps(payload, default=str).encode(), {"Content-Type": "application/json"}
+            else:
+                status, headers, data = standin.handle(self.command, base_url + self.path, dict(self.headers.items()), body)
+                # Absolute URLs handed out by the models (Link, archive
+                # download URLs) must lead back here.
+                data = data.replace(b"https://api.github.com", base_url.encode())
+                headers = {k: v.replace("https://api.github.com", base_url) for k, v in headers.items()}
+            self.send_response(status)
+            for k, v in headers.items():
+                if k.lower() not in ("content-length", "connection", "transfer-encoding"):
+                    self.send_header(k, v)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(data)
+
+        do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = do_HEAD = _serve
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def serve(scenario, host="127.0.0.1", port=8750, speed=1.0, cassette=None, record=None):
+    """Start the stand-in server in a background thread; returns (server, standin)."""
+    standin = StandIn(scenario, speed=speed, cassette=cassette, record=record)
+    httpd = ThreadingHTTPServer((host, port), None)
+    base_url = f"http://{host}:{httpd.server_address[1]}"
+    httpd.RequestHandlerClass = make_handler(standin, base_url)
+    threading.Thread(target=standin.pump, daemon=True).start()
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.base_url = base_url
+    return httpd, standin
+
+
+def main():
+    from .replay import CassetteWriter
+
+    p = argparse.ArgumentParser(prog="backlog_sim.server", description=__doc__.splitlines()[0])
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8750)
+    p.add_argument("--speed", type=float, default=1.0, help="modeled seconds per wall-clock second")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--alerts", type=int, default=722)
+    p.add_argument("--files", type=int, default=56)
+    p.add_argument("--external-sessions", type=int, default=0)
+    p.add_argument("--faults", help="JSON fault plan (see faults.py)")
+    p.add_argument("--replay", help="serve a recorded cassette instead of the models")
+    p.add_argument("--record", help="append every exchange to this cassette")
+    args = p.parse_args()
+
+    faults = []
+    if args.faults:
+        with open(args.faults) as f:
+            faults = json.load(f)
+    scenario = Scenario(name="standin", seed=args.seed, alerts=args.alerts, files=args.files,
+                        external_sessions=args.external_sessions, faults=faults)
+    cassette = Cassette.load(args.replay) if args.replay else None
+    record = CassetteWriter(args.record) if args.record else None
+    httpd, _ = serve(scenario, args.host, args.port, args.speed, cassette, record)
+    print(f"export GITHUB_API_URL={httpd.base_url} DEVIN_API_URL={httpd.base_url}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
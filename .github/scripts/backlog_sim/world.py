@@ -0,0 +1,304 @@
+"""Simulated world: clock, API models, the child batch run lifecycle, and
+the other holders of the Devin account's sessions: PR security reviews and
+other repositories' orchestrators (OrgPeer)."""
+import base64
+import json
+import random
+import re
+from collections import Counter
+from urllib.parse import parse_qs, urlsplit
+
+from .clock import VirtualClock
+from .faults import FaultInjector
+from .models import REPO, RESULT_MARKER, DevinModel, GitHubModel, iso
+
+
+class World:
+    def __init__(self, scenario, batch_inputs, alert_paths, clock=None, sleep=None):
+        self.scenario = scenario
+        self.clock = clock or VirtualClock()
+        self.started_at = self.clock.now
+        self.rng = random.Random(scenario.seed)
+        self.github = GitHubModel(self, batch_inputs)
+        self.devin = DevinModel(self)
+        self.calls = Counter()
+        self.statuses = Counter()
+        self.events = []
+        self.current_url = ""
+        self.github.seed_alerts(scenario.alerts, alert_paths, self.rng)
+        self.pr_reviews = []          # per review run: {"run", "attempts", "waited_s", "ok"}
+        for i in range(scenario.pr_reviews):
+            at = scenario.pr_burst_at_s + scenario.pr_burst_s * i / max(scenario.pr_reviews, 1)
+            self.clock.schedule(self.started_at + at, self.start_pr_review, i + 1)
+        self.faults = FaultInjector(scenario.faults, self.clock, scenario.seed, sleep) if scenario.faults else None
+        self.transport = self.faults.wrap(self.answer) if self.faults else self.answer
+
+    def log_event(self, kind, **data):
+        self.events.append({"t": round(self.clock.now, 1), "event": kind, **data})
+
+    # ---- transport ----------------------------------------------------------
+    def is_devin(self, url):
+        parts = urlsplit(url)
+        return "devin" in parts.netloc or parts.path.startswith("/v1/")
+
+    def latency(self, url):
+        return self.scenario.devin_latency_s if self.is_devin(url) else self.scenario.github_latency_s
+
+    def request(self, method, url, headers=None, body=None):
+        """Answer one HTTP request. Returns (status, headers, body_bytes).
+        The clock advances by the modeled API latency first, so anything
+        that becomes due during the round trip is visible in the response."""
+        self.clock.sleep(self.latency(url))
+        return self.transport(method, url, headers, body)
+
+    def answer(self, method, url, headers=None, body=None):
+        """Route a request to the GitHub or Devin model (no latency, no faults)."""
+        parts = urlsplit(url)
+        query = {k: v[-1] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        lower = {k.lower(): v for k, v in (headers or {}).items()}
+        router = self.devin.router if self.is_devin(url) else self.github.router
+        self.current_url = url
+        name, (status, resp_headers, payload) = router.dispatch(method.upper(), parts.path, query, lower, body)
+        self.calls[name] += 1
+        self.statuses[f"{name} {status}"] += 1
+        if payload is None:
+            data = b""
+        elif isinstance(payload, (bytes, bytearray)):
+            data = bytes(payload)
+        else:
+            data = json.dumps(payload).encode()
+            resp_headers = {"Content-Type": "application/json", **resp_headers}
+        return status, resp_headers, data
+
+    # ---- PR security review ----------------------------------------------------
+    def start_pr_review(self, pr_number):
+        """A devin-security-review.yml run for a newly opened PR: setup, one
+        session with the 60/120/240s 429 retries (EC-7), then completion."""
+        sc = self.scenario
+        run = self.github.new_review_run(pr_number)
+        review = {"run": run["id"], "attempts": 0, "waited_s": None, "ok": None}
+        self.pr_reviews.append(review)
+
+        def finish(ok):
+            run.update(status="completed", conclusion="success" if ok else "failure", updated_at=iso(self.clock.now))
+            review["ok"] = ok
+
+        def attempt(backoff):
+            review["attempts"] += 1
+            status, _, body = self.devin.create(None, {}, {}, json.dumps({"prompt": f"Review PR #{pr_number}"}).encode())
+            if status == 200:
+                sid = body["session_id"]
+                self.devin.sessions[sid]["holder"] = "pr-review"
+                review["waited_s"] = round(self.clock.now - run["_created"] - sc.pr_setup_s, 1)
+                self.clock.after(sc.pr_session_s, lambda: (self.devin.terminate(sid), finish(True)))
+            elif backoff:
+                self.clock.after(backoff[0], attempt, backoff[1:])
+            else:
+                finish(False)
+
+        run["status"] = "in_progress"
+        self.clock.after(sc.pr_setup_s, attempt, [60, 120, 240])
+
+    # ---- child batch run ------------------------------------------------------
+    def child_poll(self, session, start, estimate):
+        """When the child's "Poll Devin session status" step sees the session
+        end, as (time, "finished"), or gives up, as (time, "timeout"). Follows
+        the step's schedule: every child_poll_s without an estimate, otherwise
+        sparse until mean - 2sd, every sd/8 (15s..child_poll_s) up to
+        mean + 2sd, then every child_poll_s; at most child_poll_budget polls."""
+        sc = self.scenario
+        m = re.fullmatch(r"(\d+),(\d+)", estimate or "")
+        mean, sd = (int(m.group(1)), int(m.group(2))) if m else (None, None)
+        deadline = start + sc.child_poll_deadline_s
+        t, polls = start, 0
+        while polls < sc.child_poll_budget and t <= deadline:
+            polls += 1
+            if t >= session["end"]:
+                return t, "finished"
+            age = t - session["created"]
+            if mean is None or age > mean + 2 * sd:
+                interval = sc.child_poll_s
+            elif age < mean - 2 * sd:
+                interval = mean - 2 * sd - age
+            else:
+                interval = min(sc.child_poll_s, max(15, sd // 8))
+            t += max(1, min(interval, 300, deadline - t))
+        return t, "timeout"
+
+    def start_child(self, inputs):
+        """A dispatched devin-security-batch.yml run, from queue to artifact."""
+        sc = self.scenario
+        gh = self.github
+        run_id = gh.new_run(inputs)
+        self.log_event("run_created", run_id=run_id, batch=inputs.get("batch_id"))
+        setup_done = self.clock.now + self.rng.expovariate(1 / sc.queue_delay_s) + sc.child_setup_s
+
+        def in_progress():
+            gh.runs[run_id]["status"] = "in_progress"
+            gh.runs[run_id]["updated_at"] = iso(self.clock.now)
+
+        def session_done():
+            sid = inputs.get("session_id", "")
+            session = self.devin.sessions.get(sid)
+            if not session:
+                finish("failure", "error", None)
+                return
+            when, status = self.child_poll(session, setup_done, inputs.get("session_estimate", ""))
+            self.clock.schedule(when, after_session, sid, status)
+
+        def after_session(sid, status):
+            if sc.terminate_sessions:
+                self.devin.terminate(sid)
+            else:
+                # Bug #62: a finished-but-not-terminated session keeps its slot
+                # until Devin's backend reclaims it.
+                self.clock.after(self.rng.uniform(sc.zombie_min_s, sc.zombie_max_s), self.devin.release, sid)
+            self.clock.after(max(10.0, self.rng.gauss(sc.post_session_s, sc.post_session_s / 4)),
+                             finish, "success", status, sid)
+
+        def finish(conclusion, session_status, sid):
+            if self.rng.random() < sc.child_failure_rate:
+                conclusion = "failure"
+            ids = [int(x) for x in inputs.get("alert_ids", "").split(",") if x.strip()]
+            fixed, attempted, unfixable = [], [], []
+            for aid in ids:
+                r = self.rng.random()
+                if session_status != "finished":
+                    unfixable.append(aid)
+                elif r < sc.p_fixed:
+                    fixed.append(aid)
+                elif r < sc.p_fixed + sc.p_unfixable:
+                    unfixable.append(aid)
+                else:
+                    attempted.append(aid)
+            session = self.devin.sessions.get(sid or "")
+            alerts = gh.alerts
+            result = {
+                "batch_id": inputs.get("batch_id"),
+                "alert_ids": [str(a) for a in ids],
+                "fixed_alert_ids": [str(a) for a in fixed],
+                "attempted_alert_ids": [str(a) for a in attempted],
+                "unfixable_alert_ids": [str(a) for a in unfixable],
+                "session_id": sid or "",
+                "session_status": session_status,
+                "pr_url": f"https://github.com/{REPO}/pull/{run_id % 100000}" if attempted else "",
+                "session_duration_s": int(self.clock.now - session["created"]) if session else None,
+                "alert_rules": {str(a): alerts[a]["rule"]["id"] for a in ids if a in alerts},
+                "alert_files": {str(a): alerts[a]["most_recent_instance"]["location"]["path"] for a in ids if a in alerts},
+            }
+            gh.add_artifact(run_id, f"batch-{inputs.get('batch_id')}-result", result)
+            if inputs.get("tracking_issue", "").isdigit() and sc.result_comments:
+                result["run_id"] = run_id
+                gh.create_comment(re.match(r"(\d+)", inputs["tracking_issue"]), {}, {}, json.dumps(
+                    {"body": f"{RESULT_MARKER}{json.dumps(result, separators=(',', ':'))} -->\n"
+                             f"Batch #{result['batch_id']}: {len(fixed)} fixed, {len(attempted)} attempted, "
+                             f"{len(unfixable)} unfixable"}).encode())
+            run = gh.runs[run_id]
+            run["status"] = "completed"
+            run["conclusion"] = conclusion
+            run["updated_at"] = iso(self.clock.now)
+            self.log_event("run_completed", run_id=run_id, batch=inputs.get("batch_id"), conclusion=conclusion)
+
+        self.clock.schedule(setup_done - sc.child_setup_s, in_progress)
+        self.clock.schedule(setup_done, session_done)
+        return run_id
+
+
+class OrgPeer:
+    """Another repository's orchestrator on the same Devin account. It follows
+    the workflow's org ledger protocol on the modeled git objects: publish its
+    entry (on change, or when the heartbeat is a third of the TTL old), create
+    a session only while under its fair share (the workflow's own
+    fair_shares), the account's session limit and the shared creation rate,
+    and release each session when it ends."""
+
+    def __init__(self, world, name, ref, fair_shares, limit, capacity, window, ttl, poll_s=60):
+        sc = world.scenario
+        self.world = world
+        self.name = name
+        self.ref = ref.removeprefix("refs/")
+        self.fair_shares = fair_shares
+        self.limit = limit
+        self.capacity = capacity
+        self.window = window
+        self.ttl = ttl
+        self.poll_s = poll_s
+        self.remaining = sc.peer_batches
+        self.held = set()
+        self.sessions = 0
+        self.done_at = None
+
+    def start(self):
+        self.world.clock.schedule(self.world.started_at + self.world.scenario.peer_start_s, self.tick)
+
+    def _git(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else None
+        _, (status, _, data) = self.world.github.router.dispatch(method, f"/repos/{REPO}/git/{path}", {}, {}, body)
+        return status, data
+
+    def _load(self):
+        status, ref = self._git("GET", f"ref/{self.ref}")
+        if status != 200:
+            return None, {"repos": {}, "creations": [], "blocked_until": 0}
+        head = ref["object"]["sha"]
+        _, commit = self._git("GET", f"commits/{head}")
+        _, tree = self._git("GET", f"trees/{commit['tree']['sha']}")
+        _, blob = self._git("GET", f"blobs/{tree['tree'][0]['sha']}")
+        return head, json.loads(base64.b64decode(blob["content"]))
+
+    def _store(self, head, data):
+        content = base64.b64encode(json.dumps(data, sort_keys=True).encode()).decode()
+        _, blob = self._git("POST", "blobs", {"content": content, "encoding": "base64"})
+        _, tree = self._git("POST", "trees", {"tree": [{"path": "ledger.json", "mode": "100644", "type": "blob", "sha": blob["sha"]}]})
+        _, commit = self._git("POST", "commits", {"message": f"Org ledger: {self.name}", "tree": tree["sha"],
+                                                  "parents": [head] if head else []})
+        if head:
+            self._git("PATCH", f"refs/{self.ref}", {"sha": commit["sha"], "force": False})
+        else:
+            self._git("POST", "refs", {"ref": f"refs/{self.ref}", "sha": commit["sha"]})
+
+    def tick(self):
+        sc = self.world.scenario
+        now = self.world.clock.now
+        devin = self.world.devin
+        head, data = self._load()
+        live = {r: e for r, e in data.get("repos", {}).items() if r != self.name and now - e.get("heartbeat", 0) < self.ttl}
+        before = data.get("repos", {}).get(self.name, {})
+        me = dict(before, held=len(self.held), pending=min(self.remaining, sc.peer_concurrent - len(self.held)),
+                  weight=max(1, sc.peer_weight * (self.remaining + len(self.held)) // max(sc.peer_batches, 1)))
+        live[self.name] = me
+        creations = data.get("creations", [])
+        admitted = False
+        while (me["pending"] > 0 and now >= data.get("blocked_until", 0)
+               and sum(1 for t in creations if now - t < self.window) < self.capacity):
+            if (me["held"] >= self.fair_shares(live, self.limit)[self.name]
+                    or sum(e.get("held", 0) for e in live.values()) >= self.limit):
+                break
+            status, headers, body = devin.create(None, {}, {}, json.dumps({"prompt": f"Security fixes for {self.name}"}).encode())
+            if status != 200:
+                if "concurrent" not in body.get("detail", ""):
+                    data["blocked_until"] = int(now + float(headers.get("Retry-After", self.window)))
+                break
+            sid = body["session_id"]
+            devin.sessions[sid]["holder"] = self.name
+            self.held.add(sid)
+            self.world.clock.schedule(devin.sessions[sid]["end"], self.release, sid)
+            self.remaining -= 1
+            self.sessions += 1
+            me.update(held=me["held"] + 1, pending=me["pending"] - 1, last_admitted=int(now))
+            creations.append(int(now))
+            admitted = True
+        changed = admitted or any(before.get(k) != me[k] for k in ("held", "pending", "weight"))
+        if changed or now - before.get("heartbeat", 0) > self.ttl / 3:
+            data.setdefault("repos", {})[self.name] = dict(me, heartbeat=int(now), run="peer")
+            data["creations"] = creations
+            self._store(head, data)
+        if self.remaining or self.held:
+            self.world.clock.after(self.poll_s, self.tick)
+        elif self.done_at is None:
+            self.done_at = now
+            self.world.log_event("peer_done", repo=self.name, sessions=self.sessions)
+
+    def release(self, sid):
+        self.world.devin.terminate(sid)
+        self.held.discard(sid)